@@ -0,0 +1,706 @@
+"""
+Analysis core for the CodeGraph Python helper.
+
+Kept free of stdin/stdout handling so it can be compiled ahead of time
+with mypyc (`mypyc _analyze.py` in this directory); the interpreter
+prefers the resulting extension module over this file automatically,
+and this pure-Python module remains the fallback.
+"""
+
+import ast
+import codecs
+import hashlib
+import itertools
+import os
+import pickle
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+# Bump when the analyzer changes in a way that invalidates cached ASTs
+AST_CACHE_VERSION = 2
+
+# Below this many files, process startup costs more than it saves
+PARALLEL_THRESHOLD = 50
+
+# Decorator names that mark a function as an entry point
+ENTRY_POINT_RE = re.compile(r"route|get|post|put|delete|command|task")
+
+# Only Python sources are worth parsing
+PY_SUFFIXES = (".py", ".pyi")
+
+
+def _max_source_bytes() -> int:
+    # Files larger than this are assumed generated (proto stubs, model
+    # wrappers) and skipped; override via CODEGRAPH_MAX_BYTES
+    try:
+        return int(os.environ.get("CODEGRAPH_MAX_BYTES", ""))
+    except ValueError:
+        return 1024 * 1024
+
+
+MAX_SOURCE_BYTES = _max_source_bytes()
+
+
+# Output records, mirroring the GraphNode/GraphEdge types on the TS side.
+# Slots classes are a fraction of the size of the dicts they replace
+# (no per-object hash table) and field access compiles to LOAD_ATTR_SLOT.
+# Field names are the JSON keys, so serialization is a plain field dump.
+
+
+@dataclass(slots=True)
+class Parameter:
+    name: str
+    type: str | None
+    isUsed: bool
+    position: int
+
+
+@dataclass(slots=True)
+class GraphNode:
+    id: str
+    name: str
+    qualifiedName: str
+    filePath: str
+    startLine: int
+    endLine: int
+    language: str
+    kind: str
+    visibility: str
+    isEntryPoint: bool
+    parameters: list[Parameter]
+    unusedParameters: list[str]
+    packageOrModule: str
+    linesOfCode: int
+    status: str
+    color: str
+    decorators: list[str]
+
+
+@dataclass(slots=True)
+class CallSite:
+    filePath: str
+    line: int
+    column: int
+
+
+@dataclass(slots=True)
+class GraphEdge:
+    source: str
+    target: str
+    callSite: CallSite
+    kind: str
+    isResolved: bool
+
+
+@dataclass(slots=True)
+class PendingCall:
+    """Call site captured during the per-file pass, resolved into an edge
+    once the global function map is complete. Never serialized."""
+
+    source_id: str
+    target_name: str
+    line: int
+    column: int
+
+
+def analyze_files(files: list[str], project_root: str) -> dict:
+    nodes: list[GraphNode] = []
+    edges: list[GraphEdge] = []
+
+    # First pass: collect all function definitions
+    func_map: dict[str, GraphNode] = {}  # qualified_name -> node info
+    methods_by_name: dict[str, str] = {}  # method name -> first seen node id
+    by_module_name: dict[tuple[str, str], str] = {}  # (module, name) -> node id
+
+    # Each file's tree is walked exactly once, in the worker: the fused
+    # pass yields both nodes and pending call records, so neither source
+    # text nor trees survive past per-file extraction.
+    pending: list[tuple[str, list[PendingCall]]] = []
+
+    cache_dir = os.environ.get("CODEGRAPH_AST_CACHE_DIR")
+    cache_hits = 0
+    cache_misses = 0
+
+    work = [(file_path, os.path.join(project_root, file_path), cache_dir) for file_path in files]
+
+    # Parsing and node extraction are independent per file; on larger
+    # projects fan out across cores. Edges stay in the parent because
+    # resolution needs the complete func_map.
+    if len(work) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(parse_and_extract, work, chunksize=8))
+    else:
+        results = [parse_and_extract(item) for item in work]
+
+    for file_path, file_nodes, file_calls, cache_hit in results:
+        if file_nodes is None:
+            continue
+        if cache_dir:
+            if cache_hit:
+                cache_hits += 1
+            else:
+                cache_misses += 1
+
+        pending.append((file_path, file_calls))
+        for node in file_nodes:
+            nodes.append(node)
+            func_map[node.id] = node
+            if node.kind == "method":
+                methods_by_name.setdefault(node.name, node.id)
+
+            by_module_name[(node.packageOrModule, node.name)] = node.id
+
+    # Second pass: pure dict-lookup resolution, no tree re-traversal
+    for file_path, file_calls in pending:
+        file_edges = resolve_calls(
+            file_path, file_calls, func_map, methods_by_name, by_module_name
+        )
+        edges.extend(file_edges)
+
+    if cache_dir:
+        print(
+            f"ast-cache: {cache_hits} hits, {cache_misses} misses",
+            file=sys.stderr,
+        )
+
+    return {"nodes": nodes, "edges": edges}
+
+
+def parse_and_extract(
+    work_item: tuple[str, str, str | None],
+) -> tuple[str, list[GraphNode] | None, list[PendingCall], bool]:
+    """Per-file unit of work, safe to run in a worker process."""
+    file_path, abs_path, cache_dir = work_item
+
+    if not file_path.endswith(PY_SUFFIXES):
+        return file_path, None, [], False
+
+    # ast.parse accepts bytes and honors the encoding declaration itself,
+    # so the file is read in binary mode with no separate existence check
+    source = read_source(abs_path)
+    if source is None:
+        return file_path, None, [], False
+
+    tree = None
+    cache_hit = False
+    if cache_dir:
+        cache_key = ast_cache_key(source)
+        tree = ast_cache_load(cache_dir, cache_key)
+    if tree is not None:
+        cache_hit = True
+    else:
+        try:
+            tree = ast.parse(source, filename=file_path)
+        except (SyntaxError, ValueError):
+            return file_path, None, [], False
+        strip_docstrings(tree)
+        if cache_dir:
+            ast_cache_store(cache_dir, cache_key, tree)
+
+    nodes, calls = extract_file(tree, file_path, source)
+    return file_path, nodes, calls, cache_hit
+
+
+def strip_docstrings(tree: ast.Module) -> None:
+    """Drop docstring statements; nothing in the analyzer reads them.
+
+    Docstrings are often the largest string constants in a codebase.
+    compile(..., optimize=2) does not remove them at the AST level (the
+    -OO strip happens during bytecode generation), so it is done here
+    explicitly. Emitted line spans are unaffected: they come from the
+    def/class header tokens, not the body.
+    """
+    stack: list = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(
+            node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            body = node.body
+            if body:
+                first = body[0]
+                if (
+                    type(first) is ast.Expr
+                    and type(first.value) is ast.Constant
+                    and type(first.value.value) is str
+                ):
+                    del body[0]
+        stack.extend(ast.iter_child_nodes(node))
+
+
+def read_source(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            # fstat on the already-open fd costs no extra path lookup
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_SOURCE_BYTES:
+                # Say so on stderr, like the cache stats, so a vanished
+                # file reads as filtering rather than failure
+                print(
+                    f"skipping oversized file ({size} > {MAX_SOURCE_BYTES} bytes): {path}",
+                    file=sys.stderr,
+                )
+                return None
+            return f.read()
+    except OSError:
+        return None
+
+
+def ast_cache_key(source: bytes) -> str:
+    tag = f"{AST_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:"
+    return hashlib.sha256(tag.encode() + source).hexdigest()
+
+
+def ast_cache_load(cache_dir: str, key: str) -> ast.Module | None:
+    # A missing, truncated, or otherwise bad entry must only ever cost a
+    # re-parse, whatever unpickling happens to raise
+    try:
+        with open(os.path.join(cache_dir, key + ".pickle"), "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def ast_cache_store(cache_dir: str, key: str, tree: ast.Module) -> None:
+    # Dump to a temp file and rename into place: pool workers can write
+    # the same key concurrently (identical sources share one entry) and
+    # a plain open would let their writes interleave
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, os.path.join(cache_dir, key + ".pickle"))
+    except Exception:
+        # pickle.dump recurses per AST node, so deeply nested expressions
+        # can raise RecursionError; the opt-in cache must never fail an
+        # analysis that works without it, so just skip caching the entry
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+# Sentinel marking the end of a function's subtree on the traversal stack
+_POP_FUNC = object()
+
+
+class Collector:
+    """Single-pass collector of everything the extractors need from a tree:
+    function definitions, class parentage, the names loaded inside each
+    function, and the calls made from each function. One descent replaces
+    the per-function ast.walk passes."""
+
+    def __init__(self) -> None:
+        self.functions: list[ast.FunctionDef | ast.AsyncFunctionDef] = []
+        # id(func) -> class name, built once per tree; replaces the old
+        # get_parent_class full-tree scan per function
+        self.parent_class: dict[int, str] = {}
+        self.used_names: dict[int, set[str]] = {}  # id(func) -> Name-Load ids
+        # (call, innermost enclosing function)
+        self.calls: list[tuple[ast.Call, ast.FunctionDef | ast.AsyncFunctionDef]] = []
+
+    def visit(self, tree: ast.Module) -> None:
+        # Explicit-stack pre-order traversal: no generator frames (ast.walk)
+        # and no per-node method dispatch (NodeVisitor.generic_visit).
+        # A sentinel pushed under a function's children marks where its
+        # scope ends so names in nested functions also count as used in
+        # the enclosing function (closures keep parameters alive).
+        functions = self.functions
+        parent_class = self.parent_class
+        used_names = self.used_names
+        calls = self.calls
+        iter_child_nodes = ast.iter_child_nodes
+        func_stack: list[ast.FunctionDef | ast.AsyncFunctionDef] = []
+        stack: list = [tree]
+        while stack:
+            node = stack.pop()
+            if node is _POP_FUNC:
+                finished = func_stack.pop()
+                if func_stack:
+                    used_names[id(func_stack[-1])] |= used_names[id(finished)]
+                continue
+
+            t = type(node)
+            if t is _NAME:
+                if func_stack and type(node.ctx) is ast.Load:
+                    used_names[id(func_stack[-1])].add(node.id)
+                continue
+            if t is _CALL:
+                if func_stack:
+                    calls.append((node, func_stack[-1]))
+            elif t is ast.FunctionDef or t is ast.AsyncFunctionDef:
+                functions.append(node)
+                used_names[id(node)] = set()
+                func_stack.append(node)
+                stack.append(_POP_FUNC)
+            elif t is ast.ClassDef:
+                # Only direct children of the class body count as methods
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        parent_class[id(child)] = node.name
+
+            # Reversed so children pop in source order (pre-order DFS)
+            stack.extend(reversed(list(iter_child_nodes(node))))
+
+
+def line_offsets(source: bytes) -> list[int]:
+    """Byte offset of the start of each line, for slicing by AST position.
+
+    AST column offsets are byte offsets into the UTF-8 encoding of the
+    decoded text, so this table is only valid when the file itself is
+    UTF-8 — against e.g. latin-1 bytes the slices land shifted. A UTF-8
+    BOM is stripped by the tokenizer before offsets are computed, so it
+    must be stripped from the bytes too. Callers must handle both before
+    slicing with the table.
+    """
+    offsets = [0]
+    for line in source.split(b"\n"):
+        offsets.append(offsets[-1] + len(line) + 1)
+    return offsets
+
+
+def annotation_source(source: bytes, offsets: list[int], node: ast.expr) -> str | None:
+    try:
+        start = offsets[node.lineno - 1] + node.col_offset
+        end = offsets[node.end_lineno - 1] + node.end_col_offset
+        return source[start:end].decode("utf-8")
+    except (IndexError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def extract_file(
+    tree: ast.Module, file_path: str, source: bytes
+) -> tuple[list[GraphNode], list[PendingCall]]:
+    """Produce a file's nodes and its unresolved call sites from one
+    Collector pass over the tree."""
+    nodes: list[GraphNode] = []
+    module = os.path.dirname(file_path) or "."
+
+    # Annotation slicing is only sound for UTF-8 files with any BOM
+    # removed (see line_offsets); for anything else every annotation
+    # takes the ast.unparse fallback
+    if source.startswith(codecs.BOM_UTF8):
+        source = source[len(codecs.BOM_UTF8):]
+    try:
+        source.decode("utf-8")
+    except UnicodeDecodeError:
+        offsets = None
+    else:
+        offsets = line_offsets(source)
+
+    collector = Collector()
+    collector.visit(tree)
+
+    for node in collector.functions:
+        parent_class = collector.parent_class.get(id(node))
+        kind = "method" if parent_class else "function"
+        if node.name == "__init__":
+            kind = "constructor"
+
+        qualified = f"{parent_class}.{node.name}" if parent_class else node.name
+        node_id = f"{file_path}:{qualified}"
+
+        # Determine visibility
+        visibility = "module"
+        if not node.name.startswith("_"):
+            visibility = "exported"
+        elif node.name.startswith("__") and not node.name.endswith("__"):
+            visibility = "private"
+
+        # Extract and check parameters
+        params, unused_params = check_parameters(
+            node, parent_class is not None, collector.used_names[id(node)], source, offsets
+        )
+
+        # Check for decorator-based entry points
+        is_entry = False
+        decorators = []
+        if node.decorator_list:
+            for dec in node.decorator_list:
+                dec_name = get_decorator_name(dec)
+                if dec_name:
+                    decorators.append(dec_name)
+                    if ENTRY_POINT_RE.search(dec_name):
+                        is_entry = True
+
+        start_line = node.lineno
+        end_line = node.end_lineno or node.lineno
+
+        nodes.append(
+            GraphNode(
+                id=node_id,
+                name=node.name,
+                qualifiedName=f"{file_path}:{qualified}",
+                filePath=file_path,
+                startLine=start_line,
+                endLine=end_line,
+                language="python",
+                kind=kind,
+                visibility=visibility,
+                isEntryPoint=is_entry,
+                parameters=params,
+                unusedParameters=unused_params,
+                packageOrModule=module,
+                linesOfCode=end_line - start_line + 1,
+                status="dead",
+                color="red",
+                decorators=decorators,
+            )
+        )
+
+    calls: list[PendingCall] = []
+    for child, func in collector.calls:
+        # Fast path for plain-name calls: filter builtins before paying
+        # for get_call_target_name
+        fn = child.func
+        if type(fn) is _NAME:
+            target_name = fn.id
+        else:
+            target_name = get_call_target_name(child)
+            if not target_name:
+                continue
+
+        # Skip built-in and common stdlib functions
+        if target_name in BUILTIN_FUNCTIONS:
+            continue
+
+        parent_class = collector.parent_class.get(id(func))
+        qualified = f"{parent_class}.{func.name}" if parent_class else func.name
+        calls.append(
+            PendingCall(
+                source_id=f"{file_path}:{qualified}",
+                target_name=target_name,
+                line=child.lineno,
+                column=child.col_offset + 1,
+            )
+        )
+
+    return nodes, calls
+
+
+def check_parameters(
+    func: ast.FunctionDef | ast.AsyncFunctionDef,
+    is_method: bool,
+    used_names: set[str],
+    source: bytes,
+    offsets: list[int] | None,
+) -> tuple[list[Parameter], list[str]]:
+    params: list[Parameter] = []
+    unused: list[str] = []
+
+    # All parameters in declaration order (positional-only first, per
+    # PEP 570), chained lazily instead of concatenating throwaway lists
+    extras = []
+    if func.args.vararg:
+        extras.append(func.args.vararg)
+    if func.args.kwarg:
+        extras.append(func.args.kwarg)
+    all_args = itertools.chain(
+        func.args.posonlyargs, func.args.args, func.args.kwonlyargs, extras
+    )
+
+    for i, arg in enumerate(all_args):
+        name = arg.arg
+        type_str = None
+        if arg.annotation:
+            # The annotation text is already in the source; slicing it out
+            # beats re-printing the AST with ast.unparse
+            if offsets is not None:
+                type_str = annotation_source(source, offsets, arg.annotation)
+            if type_str is None:
+                try:
+                    type_str = ast.unparse(arg.annotation)
+                except Exception:
+                    pass
+
+        # Skip self/cls
+        if i == 0 and is_method and name in ("self", "cls"):
+            params.append(Parameter(name=name, type=type_str, isUsed=True, position=i))
+            continue
+
+        # Skip _ prefixed
+        if name.startswith("_"):
+            params.append(Parameter(name=name, type=type_str, isUsed=True, position=i))
+            continue
+
+        is_used = name in used_names
+        params.append(Parameter(name=name, type=type_str, isUsed=is_used, position=i))
+        if not is_used:
+            unused.append(name)
+
+    return params, unused
+
+
+def resolve_calls(
+    file_path: str,
+    calls: list[PendingCall],
+    func_map: dict[str, GraphNode],
+    methods_by_name: dict[str, str],
+    by_module_name: dict[tuple[str, str], str],
+) -> list[GraphEdge]:
+    edges = []
+    module = os.path.dirname(file_path) or "."
+
+    for call in calls:
+        target_name = call.target_name
+        kind = "direct"
+
+        # Direct resolution by full id, then by name within the module:
+        # unlike the old global short-name map, a name defined in several
+        # files no longer resolves to whichever file was analyzed last
+        if f"{file_path}:{target_name}" in func_map:
+            target_id = f"{file_path}:{target_name}"
+        else:
+            target_id = by_module_name.get((module, target_name))
+
+        # Method calls: resolve by name against any class via the index
+        if "." in target_name:
+            method_name = target_name.rsplit(".", 1)[1]
+            kind = "method"
+            target_id = methods_by_name.get(method_name, target_id)
+
+        # Constructor calls (class name = __init__)
+        init_key = f"{file_path}:{target_name}.__init__"
+        if not target_id and init_key in func_map:
+            target_id = init_key
+            kind = "constructor"
+
+        if target_id and target_id != call.source_id:
+            edges.append(
+                GraphEdge(
+                    source=call.source_id,
+                    target=target_id,
+                    callSite=CallSite(
+                        filePath=file_path,
+                        line=call.line,
+                        column=call.column,
+                    ),
+                    kind=kind,
+                    isResolved=True,
+                )
+            )
+
+    return edges
+
+
+# Hoisted so the hot name-resolution helpers compare types with a single
+# pointer check (`type(x) is _NAME`) instead of isinstance's MRO walk; the
+# parser never produces subclasses of these
+_NAME = ast.Name
+_ATTR = ast.Attribute
+_CALL = ast.Call
+
+
+def get_call_target_name(call: ast.Call) -> str | None:
+    func = call.func
+    t = type(func)
+    if t is _NAME:
+        return func.id
+    if t is _ATTR:
+        value = func.value
+        vt = type(value)
+        if vt is _NAME:
+            return f"{value.id}.{func.attr}"
+        # Chained call or complex receiver, just get the method name
+        return func.attr
+    return None
+
+
+def get_decorator_name(dec: ast.expr) -> str | None:
+    t = type(dec)
+    if t is _NAME:
+        return dec.id
+    if t is _ATTR:
+        if type(dec.value) is _NAME:
+            return f"{dec.value.id}.{dec.attr}"
+        return dec.attr
+    if t is _CALL:
+        return get_decorator_name(dec.func)
+    return None
+
+
+BUILTIN_FUNCTIONS = frozenset({
+    "print",
+    "len",
+    "range",
+    "str",
+    "int",
+    "float",
+    "bool",
+    "list",
+    "dict",
+    "set",
+    "tuple",
+    "type",
+    "isinstance",
+    "issubclass",
+    "hasattr",
+    "getattr",
+    "setattr",
+    "delattr",
+    "id",
+    "hash",
+    "repr",
+    "sorted",
+    "reversed",
+    "enumerate",
+    "zip",
+    "map",
+    "filter",
+    "any",
+    "all",
+    "min",
+    "max",
+    "sum",
+    "abs",
+    "round",
+    "input",
+    "open",
+    "super",
+    "property",
+    "staticmethod",
+    "classmethod",
+    "ValueError",
+    "TypeError",
+    "KeyError",
+    "IndexError",
+    "RuntimeError",
+    "Exception",
+    "NotImplementedError",
+    "AttributeError",
+    "OSError",
+    "IOError",
+    "StopIteration",
+    "next",
+    "iter",
+    "callable",
+    "vars",
+    "dir",
+    "globals",
+    "locals",
+    "exec",
+    "eval",
+    "compile",
+    "format",
+    "chr",
+    "ord",
+    "hex",
+    "oct",
+    "bin",
+    "pow",
+    "divmod",
+    "complex",
+    "bytes",
+    "bytearray",
+    "memoryview",
+    "frozenset",
+    "object",
+    "breakpoint",
+})
@@ -0,0 +1,84 @@
+import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { resolve } from 'node:path';
+import { mkdirSync, writeFileSync, rmSync, existsSync } from 'node:fs';
+import { execSync } from 'node:child_process';
+import type { ResolvedConfig, AnalyzerResult } from '../../src/analyzer/types.js';
+
+const FIXTURE_PATH = resolve(__dirname, '../fixtures/python-filters');
+
+// Check if Python is available
+let pythonAvailable = false;
+try {
+  execSync('python3 --version', { stdio: 'pipe' });
+  pythonAvailable = true;
+} catch {
+  try {
+    execSync('python --version', { stdio: 'pipe' });
+    pythonAvailable = true;
+  } catch {
+    // Python not available
+  }
+}
+
+// The helper skips files over 1 MiB by default (CODEGRAPH_MAX_BYTES)
+const OVERSIZED_BYTES = 1024 * 1024 + 1024;
+
+function generateFixture(): void {
+  if (existsSync(FIXTURE_PATH)) {
+    rmSync(FIXTURE_PATH, { recursive: true });
+  }
+  mkdirSync(FIXTURE_PATH, { recursive: true });
+
+  writeFileSync(resolve(FIXTURE_PATH, 'small.py'), 'def small_fn():\n    pass\n');
+  writeFileSync(
+    resolve(FIXTURE_PATH, 'big.py'),
+    'def big_fn():\n    pass\n' + '#'.repeat(OVERSIZED_BYTES)
+  );
+  // Python-looking content under a non-Python suffix
+  writeFileSync(resolve(FIXTURE_PATH, 'notes.txt'), 'def txt_fn():\n    pass\n');
+}
+
+async function runAnalyzer(): Promise<AnalyzerResult> {
+  const { PythonAnalyzer } = await import('../../src/analyzer/python/py-analyzer.js');
+
+  const config: ResolvedConfig = {
+    language: 'python',
+    // Deliberately broad so the helper's own suffix filter is exercised
+    include: ['**/*'],
+    exclude: ['**/__pycache__/**', '**/*.pyc'],
+    entryPoints: [],
+    output: './codegraph-output.json',
+    projectRoot: FIXTURE_PATH,
+  };
+
+  return new PythonAnalyzer(config).analyze();
+}
+
+describe.skipIf(!pythonAvailable)('Python Analyzer — file filtering', () => {
+  beforeAll(() => {
+    generateFixture();
+  });
+
+  afterAll(() => {
+    if (existsSync(FIXTURE_PATH)) {
+      rmSync(FIXTURE_PATH, { recursive: true });
+    }
+  });
+
+  it('should skip oversized files and non-Python suffixes by default', async () => {
+    const result = await runAnalyzer();
+    const names = result.nodes.map(n => n.name).sort();
+    expect(names).toEqual(['small_fn']);
+  });
+
+  it('should honor the CODEGRAPH_MAX_BYTES override', async () => {
+    process.env.CODEGRAPH_MAX_BYTES = String(OVERSIZED_BYTES * 2);
+    try {
+      const result = await runAnalyzer();
+      const names = result.nodes.map(n => n.name).sort();
+      expect(names).toEqual(['big_fn', 'small_fn']);
+    } finally {
+      delete process.env.CODEGRAPH_MAX_BYTES;
+    }
+  });
+});
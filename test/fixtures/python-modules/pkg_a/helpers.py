@@ -0,0 +1,5 @@
+"""Helpers for pkg_a; pkg_b defines a function with the same name."""
+
+
+def shared(value: str) -> str:
+    return f"a:{value}"
@@ -0,0 +1,7 @@
+"""Calls shared() (defined in both packages) and remote_only() (pkg_b only)."""
+from pkg_a.helpers import shared
+from pkg_b.helpers import remote_only
+
+
+def entry() -> str:
+    return shared(remote_only())
@@ -0,0 +1,9 @@
+"""Helpers for pkg_b; shared() collides with pkg_a by name."""
+
+
+def shared(value: str) -> str:
+    return f"b:{value}"
+
+
+def remote_only() -> str:
+    return "remote"